@@ -0,0 +1,263 @@
+# FILE: benchmark.py
+
+# Benchmarks for the Word Morph puzzle generator.
+# Compares the wildcard-bucket neighbor index against the original linear scan,
+# the bidirectional BFS against the one-sided search, and the NumPy graph
+# backend against the pure-Python one. The pipeline suite times the whole
+# generation pipeline on synthetic dictionaries with fixed seeds.
+
+# To run this script:
+#   python benchmark.py                          (pipeline suite)
+#   python benchmark.py --suite components       (the component comparisons)
+#   python benchmark.py --output results.json    (also save the records)
+
+import argparse
+import collections
+import contextlib
+import io
+import json
+import random
+import time
+import tracemalloc
+
+import puzzle_generator as pg
+
+# --- 1. Reference BFS (linear scan, as the generator used to work) ---
+
+def find_shortest_path_scan(start_word, target_word, dictionary_list):
+    queue = collections.deque([(start_word, [start_word])])
+    visited = {start_word}
+    while queue:
+        current_word, path = queue.popleft()
+        for neighbor in pg._find_neighbors_scan(current_word, dictionary_list):
+            if neighbor == target_word:
+                return path + [target_word]
+            if neighbor not in visited:
+                visited.add(neighbor)
+                queue.append((neighbor, path + [neighbor]))
+    return None
+
+# --- 2. Benchmarks ---
+
+def benchmark_neighbor_index(dictionary_list, num_queries=20, seed=0):
+    """
+    Times graph construction, all-word neighbor lookups and a handful of BFS
+    queries with both the linear scan and the prebuilt index.
+    Checks that both give the same neighbors and the same path lengths.
+    """
+    words = list(dict.fromkeys(dictionary_list))
+    rng = random.Random(seed)
+    pairs = [(rng.choice(words), rng.choice(words)) for _ in range(num_queries)]
+
+    start = time.perf_counter()
+    graph = pg.WordGraph(words)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scan_neighbors = [pg._find_neighbors_scan(word, words) for word in words]
+    scan_lookup_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index_neighbors = [graph.neighbors(word) for word in words]
+    index_lookup_time = time.perf_counter() - start
+
+    assert scan_neighbors == index_neighbors, "Index neighbors differ from linear scan"
+
+    start = time.perf_counter()
+    scan_paths = [find_shortest_path_scan(a, b, words) for a, b in pairs]
+    scan_bfs_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index_paths = [pg.find_shortest_path_bfs(a, b, graph) for a, b in pairs]
+    index_bfs_time = time.perf_counter() - start
+
+    for (a, b), scan_path, index_path in zip(pairs, scan_paths, index_paths):
+        if a == b:
+            continue
+        assert (scan_path is None) == (index_path is None), f"Reachability differs for {a}->{b}"
+        if scan_path:
+            assert len(scan_path) == len(index_path), f"Path length differs for {a}->{b}"
+
+    return {
+        "words": len(words),
+        "graph_build_s": build_time,
+        "scan_lookup_s": scan_lookup_time,
+        "index_lookup_s": index_lookup_time,
+        "scan_bfs_s": scan_bfs_time,
+        "index_bfs_s": index_bfs_time,
+    }
+
+def benchmark_bidirectional_bfs(dictionary_list, num_queries=200, seed=0):
+    """
+    Times one-sided and bidirectional BFS on the same random pairs and records
+    the peak memory of each with tracemalloc. Checks that path lengths match.
+    """
+    graph = pg.get_word_graph(dictionary_list)
+    rng = random.Random(seed)
+    pairs = [(rng.choice(graph.words), rng.choice(graph.words)) for _ in range(num_queries)]
+
+    results = {"queries": num_queries}
+    paths = {}
+    for name, bidirectional in (("one_sided", False), ("bidirectional", True)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        paths[name] = [pg.find_shortest_path_bfs(a, b, graph, bidirectional=bidirectional) for a, b in pairs]
+        results[f"{name}_s"] = time.perf_counter() - start
+        results[f"{name}_peak_kb"] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+
+    for (a, b), one_sided, both in zip(pairs, paths["one_sided"], paths["bidirectional"]):
+        assert (one_sided is None) == (both is None), f"Reachability differs for {a}->{b}"
+        if one_sided:
+            assert len(one_sided) == len(both), f"Path length differs for {a}->{b}"
+
+    return results
+
+def benchmark_graph_backends(dictionary_list):
+    """Times WordGraph construction with each backend and checks the graphs are identical."""
+    results = {"words": len(dictionary_list)}
+    graphs = {}
+    for backend in ("python", "numpy"):
+        if backend == "numpy" and pg.np is None:
+            continue
+        start = time.perf_counter()
+        graphs[backend] = pg.WordGraph(dictionary_list, backend)
+        results[f"{backend}_build_s"] = time.perf_counter() - start
+
+    if "numpy" in graphs:
+        python_graph, numpy_graph = graphs["python"], graphs["numpy"]
+        assert list(python_graph.offsets) == list(numpy_graph.offsets), "Backends disagree on neighbor counts"
+        assert list(python_graph.neighbor_array) == list(numpy_graph.neighbor_array), "Backends disagree on neighbors"
+    return results
+
+# --- 3. Pipeline Benchmark Suite ---
+
+def make_synthetic_dictionary(size, length=4, alphabet="ABCDEFGHIJKLMNOP", seed=0):
+    """
+    Returns `size` distinct random words. A small alphabet keeps the graph
+    about as densely connected as a real word list of the same size.
+    """
+    if size > len(alphabet) ** length:
+        raise ValueError(f"Cannot make {size} distinct {length}-letter words from {len(alphabet)} letters.")
+    rng = random.Random(seed)
+    words = {}
+    while len(words) < size:
+        words["".join(rng.choice(alphabet) for _ in range(length))] = None
+    return list(words)
+
+def _run_pipeline(words, length, puzzles, seed, max_attempts):
+    """Builds the graph and tables from scratch, then generates puzzles. Returns (build_s, generate_s, generated)."""
+    pg.clear_graph_caches()
+    store = pg.WordStore(words) # A fresh store has no graphs of its own yet
+
+    start = time.perf_counter()
+    store.graph_and_distances(length, length, cache_dir=None)
+    build_time = time.perf_counter() - start
+
+    random.seed(seed)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()): # Silence the per-attempt progress lines
+        generated = sum(1 for _ in range(puzzles)
+                        if pg.generate_word_morph_puzzle(store, length, length, max_attempts=max_attempts,
+                                                         cache_dir=None, with_fun_fact=False))
+    return build_time, time.perf_counter() - start, generated
+
+def benchmark_pipeline(sizes=(1000, 4000, 16000), seeds=(0, 1), puzzles=20, length=4, max_attempts=1000):
+    """
+    Runs the generation pipeline (no fun facts, no disk cache) for every
+    dictionary size and seed. Each run is done twice: once for timings and the
+    pipeline stats, and once under tracemalloc for peak memory, so tracing
+    does not skew the timings. Returns one JSON-ready record per run.
+    """
+    records = []
+    for size in sizes:
+        for seed in seeds:
+            words = make_synthetic_dictionary(size, length, seed=seed)
+
+            stats = pg.enable_stats()
+            try:
+                build_time, generate_time, generated = _run_pipeline(words, length, puzzles, seed, max_attempts)
+            finally:
+                pg.disable_stats()
+
+            tracemalloc.start()
+            try:
+                _run_pipeline(words, length, puzzles, seed, max_attempts)
+                peak_bytes = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+            records.append({
+                "words": size,
+                "length": length,
+                "seed": seed,
+                "puzzles_requested": puzzles,
+                "puzzles_generated": generated,
+                "graph_build_s": build_time,
+                "generate_s": generate_time,
+                "peak_memory_kb": peak_bytes / 1024,
+                "stats": stats.as_dict(),
+            })
+    return records
+
+def run_component_benchmarks():
+    dictionary = [word for word in pg.DICTIONARY if len(word) == 4]
+    results = benchmark_neighbor_index(dictionary)
+
+    print("--- Neighbor Index Benchmark ---")
+    print(f"Words: {results['words']}")
+    print(f"Graph build: {results['graph_build_s'] * 1000:.1f} ms")
+    print(f"Neighbor lookups (scan):  {results['scan_lookup_s'] * 1000:.1f} ms")
+    print(f"Neighbor lookups (index): {results['index_lookup_s'] * 1000:.1f} ms")
+    print(f"BFS queries (scan):  {results['scan_bfs_s'] * 1000:.1f} ms")
+    print(f"BFS queries (index): {results['index_bfs_s'] * 1000:.1f} ms")
+
+    results = benchmark_bidirectional_bfs(dictionary)
+
+    print("\n--- Bidirectional BFS Benchmark ---")
+    print(f"Queries: {results['queries']}")
+    print(f"One-sided:     {results['one_sided_s'] * 1000:.1f} ms, peak {results['one_sided_peak_kb']:.1f} KB")
+    print(f"Bidirectional: {results['bidirectional_s'] * 1000:.1f} ms, peak {results['bidirectional_peak_kb']:.1f} KB")
+
+    results = benchmark_graph_backends(pg.DICTIONARY)
+
+    print("\n--- Graph Backend Benchmark ---")
+    print(f"Words: {results['words']}")
+    print(f"Python build: {results['python_build_s'] * 1000:.1f} ms")
+    if "numpy_build_s" in results:
+        print(f"NumPy build:  {results['numpy_build_s'] * 1000:.1f} ms")
+    else:
+        print("NumPy build:  skipped (NumPy not installed)")
+
+def run_pipeline_benchmarks(sizes, seeds, puzzles):
+    records = benchmark_pipeline(sizes=sizes, seeds=seeds, puzzles=puzzles)
+
+    print("--- Pipeline Benchmark ---")
+    print(f"{'words':>7} {'seed':>4} {'build ms':>9} {'gen ms':>8} {'peak KB':>9} {'attempts':>8} {'rejected':>8} {'expanded':>9}")
+    for record in records:
+        counters = record["stats"]["counters"]
+        print(f"{record['words']:>7} {record['seed']:>4} {record['graph_build_s'] * 1000:>9.1f} "
+              f"{record['generate_s'] * 1000:>8.1f} {record['peak_memory_kb']:>9.0f} "
+              f"{counters.get('puzzle_attempts', 0):>8} {counters.get('attempts_rejected', 0):>8} "
+              f"{counters.get('bfs_nodes_expanded', 0):>9}")
+    return records
+
+# --- 4. Example Usage ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Word Morph puzzle generator.")
+    parser.add_argument("--suite", choices=["pipeline", "components", "all"], default="pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000, 16000], help="Synthetic dictionary sizes.")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1])
+    parser.add_argument("--puzzles", type=int, default=20, help="Puzzles generated per run.")
+    parser.add_argument("--output", help="Write the pipeline records to this JSON file.")
+    args = parser.parse_args()
+
+    if args.suite in ("components", "all"):
+        run_component_benchmarks()
+    if args.suite in ("pipeline", "all"):
+        if args.suite == "all":
+            print()
+        records = run_pipeline_benchmarks(args.sizes, args.seeds, args.puzzles)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(records, f, indent=2)
@@ -0,0 +1,230 @@
+# FILE: test_puzzle_generator.py
+
+# Tests for the Word Morph puzzle generator.
+# Run with: python -m pytest -q
+
+import collections
+import http.server
+import json
+import random
+import threading
+
+import pytest
+
+import puzzle_generator as pg
+
+WORDS_4 = list(dict.fromkeys(word for word in pg.DICTIONARY if len(word) == 4))
+SMALL_WORDS = WORDS_4[:800] # Small enough for the linear-scan reference BFS
+
+def random_pairs(words, count, seed=0):
+    rng = random.Random(seed)
+    return [(rng.choice(words), rng.choice(words)) for _ in range(count)]
+
+def scan_bfs_length(start_word, target_word, dictionary_list):
+    """Reference shortest ladder length (in transitions) using the original linear scan."""
+    depths = {start_word: 0}
+    queue = collections.deque([start_word])
+    while queue:
+        current_word = queue.popleft()
+        if current_word == target_word:
+            return depths[current_word]
+        for neighbor in pg._find_neighbors_scan(current_word, dictionary_list):
+            if neighbor not in depths:
+                depths[neighbor] = depths[current_word] + 1
+                queue.append(neighbor)
+    return None
+
+def is_ladder(path, graph):
+    return all(word in graph for word in path) and all(pg.is_morph_step(a, b) for a, b in zip(path, path[1:]))
+
+@pytest.fixture(autouse=True)
+def fresh_graph_caches():
+    pg.clear_graph_caches()
+    yield
+    pg.clear_graph_caches()
+
+# --- 1. Search ---
+
+@pytest.mark.parametrize("bidirectional", [True, False])
+def test_bfs_matches_linear_scan(bidirectional):
+    graph = pg.WordGraph(SMALL_WORDS)
+    for start_word, target_word in random_pairs(SMALL_WORDS, 40):
+        expected = scan_bfs_length(start_word, target_word, SMALL_WORDS)
+        path = pg.find_shortest_path_bfs(start_word, target_word, graph, bidirectional=bidirectional)
+        if expected is None:
+            assert path is None
+        else:
+            assert len(path) - 1 == expected
+            assert path[0] == start_word and path[-1] == target_word
+            assert is_ladder(path, graph)
+
+def test_graph_neighbors_match_linear_scan():
+    graph = pg.WordGraph(SMALL_WORDS)
+    for word in SMALL_WORDS:
+        assert graph.neighbors(word) == pg._find_neighbors_scan(word, SMALL_WORDS)
+
+@pytest.mark.parametrize("words", [
+    WORDS_4,
+    list(dict.fromkeys(pg.DICTIONARY)), # Mixed lengths
+    ["ABCDEFGHIJ", "ABCDEFGHIK", "ABCDEFGHZK", "XBCDEFGHIJ", "ABCDEFGHI", "ABCDEFGHJ"], # Over 8 letters
+    ["CAFÉ", "CAFE", "CAVÉ", "ÇAFÉ", "NAÏF", "NAIF", "COLD"], # Non-ASCII
+    ["ÉTAGÈRES", "ÉTAGÈREZ", "ÉTAPÈRES", "ABCDEFGHIJ"], # Non-ASCII and long
+    [],
+])
+def test_numpy_backend_matches_python(words):
+    pytest.importorskip("numpy")
+    python_graph = pg.WordGraph(words, "python")
+    numpy_graph = pg.WordGraph(words, "numpy")
+    assert list(numpy_graph.offsets) == list(python_graph.offsets)
+    assert list(numpy_graph.neighbor_array) == list(python_graph.neighbor_array)
+
+def test_cached_graph_respects_backend():
+    pytest.importorskip("numpy")
+    assert pg.get_word_graph(WORDS_4).backend == pg.GRAPH_BACKEND == "python"
+    assert pg.get_word_graph(WORDS_4, backend="numpy").backend == "numpy"
+    assert pg.get_word_graph(WORDS_4, backend="python").backend == "python"
+
+# --- 2. Distance Tables ---
+
+@pytest.mark.parametrize("max_table_size", [pg.MAX_TABLE_COMPONENT_SIZE, 0])
+def test_distance_table_matches_bfs(max_table_size):
+    graph = pg.WordGraph(WORDS_4)
+    distance_table = pg.DistanceTable(graph, max_table_size=max_table_size)
+    if max_table_size == 0:
+        assert not distance_table.tables
+    for start_word, target_word in random_pairs(WORDS_4, 60, seed=1):
+        start_id, target_id = graph.word_ids[start_word], graph.word_ids[target_word]
+        path = pg.find_shortest_path_bfs(start_word, target_word, graph, bidirectional=False)
+        distance = distance_table.distance(start_id, target_id)
+        if path is None:
+            assert distance is None
+            continue
+        assert distance == len(path) - 1
+        path_ids = distance_table.shortest_path_ids(start_id, target_id)
+        assert len(path_ids) == len(path)
+        assert is_ladder([graph.words[i] for i in path_ids], graph)
+
+# --- 3. Counting Optimal Paths ---
+
+def test_path_counts_match_enumeration():
+    graph = pg.WordGraph(WORDS_4)
+    distance_table = pg.get_distance_table(graph)
+    checked = 0
+    for start_word, target_word in random_pairs(WORDS_4, 80, seed=2):
+        counts = pg.count_shortest_paths(start_word, target_word, graph)
+        paths = list(pg.iter_shortest_paths(start_word, target_word, graph))
+        if counts is None:
+            assert paths == []
+            continue
+        checked += 1
+        assert counts["path_count"] == len(paths) == len({tuple(path) for path in paths})
+        assert all(len(path) - 1 == counts["optimal_path_length"] for path in paths)
+        assert all(pg.is_optimal_solution(path, graph) for path in paths)
+        start_id, target_id = graph.word_ids[start_word], graph.word_ids[target_word]
+        assert pg._count_paths_with_table(distance_table, start_id, target_id) == counts["path_count"]
+    assert checked > 0
+
+# --- 4. Puzzle Generation ---
+
+def test_batch_is_reproducible_across_worker_counts(tmp_path):
+    def batch(workers):
+        return list(pg.generate_puzzles(30, WORDS_4, seed=3, workers=workers,
+                                        with_fun_facts=False, cache_dir=str(tmp_path)))
+    one_worker = batch(1)
+    assert len(one_worker) == 30
+    assert one_worker == batch(3)
+    assert len({(p["start_word"], p["target_word"]) for p in one_worker}) == 30
+
+def test_impossible_settings_raise_right_away():
+    with pytest.raises(ValueError):
+        pg.generate_puzzles(3, WORDS_4, difficulty="Easy", min_path_len=5, with_fun_facts=False, cache_dir=None)
+    with pytest.raises(ValueError):
+        pg.generate_puzzles(3, WORDS_4, difficulty="Impossible", with_fun_facts=False, cache_dir=None)
+    with pytest.raises(ValueError):
+        pg.generate_puzzles(10, ["COLD", "CORD"], min_path_len=1, with_fun_facts=False, cache_dir=None)
+
+def test_graph_cache_round_trip_and_truncation(tmp_path):
+    graph, distance_table = pg.get_cached_graph(WORDS_4, 4, 4, cache_dir=str(tmp_path))
+    cache_path = tmp_path / pg.dictionary_cache_key(WORDS_4, 4, 4)
+    loaded_graph, loaded_table = pg.load_graph_cache(str(cache_path))
+    assert list(loaded_graph.offsets) == list(graph.offsets)
+    assert list(loaded_graph.neighbor_array) == list(graph.neighbor_array)
+    assert {i: bytes(t) for i, t in loaded_table.tables.items()} == {i: bytes(t) for i, t in distance_table.tables.items()}
+    del loaded_graph, loaded_table
+
+    with open(cache_path / "neighbors.i32", "r+b") as f:
+        f.truncate(100)
+    assert pg.load_graph_cache(str(cache_path)) is None
+
+# --- 5. Fun Fact Enrichment (against a local stub API) ---
+
+class StubApiHandler(http.server.BaseHTTPRequestHandler):
+    """Answers like the Gemini API with "Fact about WORD"; fails every request for FAIL."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = body["contents"][0]["parts"][0]["text"]
+        word = prompt.split("'")[1]
+        self.server.requested.append(word)
+        if word == "FAIL":
+            self.send_response(500)
+            self.end_headers()
+            return
+        payload = json.dumps({"candidates": [{"content": {"parts": [{"text": f" Fact about {word}. "}]}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub_api():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubApiHandler)
+    server.requested = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def enrich_options(stub_api, tmp_path):
+    return {
+        "api_url": f"http://127.0.0.1:{stub_api.server_port}/",
+        "cache_path": str(tmp_path / "fun_facts.sqlite3"),
+        "requests_per_second": 1000,
+        "backoff_factor": 0,
+    }
+
+def test_enrichment_dedupes_caches_and_falls_back(stub_api, tmp_path):
+    options = enrich_options(stub_api, tmp_path)
+    puzzles = [{"target_word": word} for word in ["COLD", "WARM", "COLD", "FAIL"]]
+    pg.enrich_fun_facts(puzzles, **options)
+
+    assert [puzzle["fun_fact"] for puzzle in puzzles] == [
+        "Fact about COLD.", "Fact about WARM.", "Fact about COLD.", pg.NO_FUN_FACT]
+    assert sorted(stub_api.requested) == ["COLD", "FAIL", "FAIL", "FAIL", "WARM"] # One request per word, 3 tries for FAIL
+
+    # Second run: successes come from the cache, the failure is retried.
+    stub_api.requested.clear()
+    again = [{"target_word": word} for word in ["COLD", "WARM", "FAIL"]]
+    pg.enrich_fun_facts(again, **options)
+    assert [puzzle["fun_fact"] for puzzle in again] == ["Fact about COLD.", "Fact about WARM.", pg.NO_FUN_FACT]
+    assert stub_api.requested == ["FAIL", "FAIL", "FAIL"]
+
+def test_streaming_enrichment_keeps_order(stub_api, tmp_path):
+    puzzles = [{"target_word": f"W{i % 7}"} for i in range(20)]
+    enriched = list(pg._enrich_as_solved(iter(puzzles), 3, **enrich_options(stub_api, tmp_path)))
+    assert enriched == puzzles
+    assert all(puzzle["fun_fact"] == f"Fact about {puzzle['target_word']}." for puzzle in enriched)
+    assert sorted(stub_api.requested) == sorted(f"W{i}" for i in range(7))
+
+def test_unwritable_fun_fact_cache_falls_back_to_memory(tmp_path):
+    blocker = tmp_path / "not_a_folder"
+    blocker.write_text("")
+    cache = pg.FunFactCache(str(blocker / "fun_facts.sqlite3"))
+    cache.put("COLD", "Fact about COLD.")
+    assert cache.get_many(["COLD", "WARM"]) == {"COLD": "Fact about COLD."}
+    cache.close()